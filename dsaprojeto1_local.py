@@ -3,20 +3,36 @@
 # Imports
 import pandas as pd
 import yfinance as yf
+import requests
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+import logging.handlers
+import concurrent.futures
 
 # Configuração de Log
+# O FileHandler fica atrás de um MemoryHandler: os registros acumulam em memória e são
+# gravados em disco em blocos (ou imediatamente a partir de ERROR), tirando a escrita
+# síncrona de cada registro do caminho quente do pipeline
+_manipulador_arquivo_log = logging.handlers.MemoryHandler(
+    capacity=1024,
+    flushLevel=logging.ERROR,
+    target=logging.FileHandler("dados_local/dsapipeline.log")
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler("dados_local/dsapipeline.log"),
+        _manipulador_arquivo_log,
         logging.StreamHandler()
     ]
 )
 
+# Sessão HTTP compartilhada pelas extrações individuais, com pool de conexões:
+# depois do primeiro handshake TLS, as demais requisições reutilizam a conexão aberta
+SESSAO_HTTP = requests.Session()
+SESSAO_HTTP.mount('https://', requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
 # Lista de ações
 ACOES_PARA_ACOMPANHAR = [
     'PETR4.SA', 'VALE3.SA', 'ITUB4.SA', 'BBDC4.SA', 
@@ -26,36 +42,84 @@ ACOES_PARA_ACOMPANHAR = [
 # Nome do banco de dados e da tabela
 NOME_BANCO_DADOS = 'dados_local/dsa_dados_mercado.db'
 NOME_TABELA = 'dados_acoes_diario'
+NOME_TABELA_STAGE = 'dados_acoes_stage'
+
+# Query de UPSERT em lote montada uma única vez na carga do módulo
+# Aplica de uma vez todo o conteúdo da tabela de staging sobre a tabela final
+# (o WHERE true é exigido pelo parser do SQLite para desambiguar o ON CONFLICT)
+_SQL_UPSERT_LOTE = f"""
+INSERT INTO {NOME_TABELA} (ticker, data_pregao, abertura, alta, baixa, fechamento, volume, datetime_coleta)
+SELECT ticker, data_pregao, abertura, alta, baixa, fechamento, volume, datetime_coleta
+FROM {NOME_TABELA_STAGE} WHERE true
+ON CONFLICT(ticker, data_pregao) DO UPDATE SET
+    abertura=excluded.abertura,
+    alta=excluded.alta,
+    baixa=excluded.baixa,
+    fechamento=excluded.fechamento,
+    volume=excluded.volume,
+    datetime_coleta=excluded.datetime_coleta;
+"""
+
+# Query de UPSERT linha a linha, usada pelo caminho alternativo que já produz tuplas
+_SQL_UPSERT_LINHA = f"""
+INSERT INTO {NOME_TABELA} (ticker, data_pregao, abertura, alta, baixa, fechamento, volume, datetime_coleta)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(ticker, data_pregao) DO UPDATE SET
+    abertura=excluded.abertura,
+    alta=excluded.alta,
+    baixa=excluded.baixa,
+    fechamento=excluded.fechamento,
+    volume=excluded.volume,
+    datetime_coleta=excluded.datetime_coleta;
+"""
 
 # Função para criar (primeira execução) ou conectar no banco de dados
-def dsa_cria_ou_conecta_banco():
+def dsa_cria_ou_conecta_banco() -> sqlite3.Connection | None:
 
     try:
 
         # Conecta ao banco de dados usando o nome definido em NOME_BANCO_DADOS
-        conn = sqlite3.connect(NOME_BANCO_DADOS)
-        
-        # Cria um cursor para executar comandos SQL
-        cursor = conn.cursor()
-        
-        # Executa a criação da tabela, caso ela ainda não exista
-        cursor.execute(f"""
-        CREATE TABLE IF NOT EXISTS {NOME_TABELA} (
-            ticker TEXT NOT NULL,                 -- Código da ação
-            data_pregao DATE NOT NULL,            -- Data do pregão
-            abertura REAL,                        -- Valor de abertura
-            alta REAL,                            -- Valor mais alto do dia
-            baixa REAL,                           -- Valor mais baixo do dia
-            fechamento REAL,                      -- Valor de fechamento
-            volume INTEGER,                       -- Volume negociado
-            datetime_coleta TEXT,                 -- Data e hora da coleta dos dados
-            PRIMARY KEY (ticker, data_pregao)     -- Chave primária composta
-        );
-        """)
-        
-        # Salva (confirma) as alterações no banco de dados
-        conn.commit()
-        
+        # isolation_level=None desliga o BEGIN implícito do módulo sqlite3: o script
+        # passa a controlar as transações explicitamente (BEGIN IMMEDIATE / COMMIT)
+        conn = sqlite3.connect(NOME_BANCO_DADOS, isolation_level=None)
+
+        # Ativa o modo WAL, que permite escritas mais rápidas sem bloquear leituras
+        conn.execute("PRAGMA journal_mode=WAL;")
+
+        # Reduz a frequência de fsync, suficiente para durabilidade em modo WAL
+        conn.execute("PRAGMA synchronous=NORMAL;")
+
+        # Mantém estruturas temporárias em memória em vez de disco
+        conn.execute("PRAGMA temp_store=MEMORY;")
+
+        # Aumenta o cache de páginas do SQLite para 64 MB
+        conn.execute("PRAGMA cache_size=-65536;")
+
+        # Verifica a versão do schema gravada no próprio banco: o DDL só precisa
+        # ser interpretado na primeira execução de cada instalação
+        if conn.execute("PRAGMA user_version;").fetchone()[0] < 1:
+
+            # Cria um cursor para executar comandos SQL
+            cursor = conn.cursor()
+
+            # Executa a criação da tabela, caso ela ainda não exista
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {NOME_TABELA} (
+                ticker TEXT NOT NULL,                 -- Código da ação
+                data_pregao DATE NOT NULL,            -- Data do pregão
+                abertura REAL,                        -- Valor de abertura
+                alta REAL,                            -- Valor mais alto do dia
+                baixa REAL,                           -- Valor mais baixo do dia
+                fechamento REAL,                      -- Valor de fechamento
+                volume INTEGER,                       -- Volume negociado
+                datetime_coleta TEXT,                 -- Data e hora da coleta dos dados
+                PRIMARY KEY (ticker, data_pregao)     -- Chave primária composta
+            );
+            """)
+
+            # Marca o schema como criado para as próximas execuções pularem o DDL
+            conn.execute("PRAGMA user_version = 1;")
+
         # Registra em log que o banco e a tabela foram criados ou verificados
         logging.info(f"Banco de dados '{NOME_BANCO_DADOS}' e tabela '{NOME_TABELA}' verificados/criados com sucesso.")
         
@@ -70,40 +134,103 @@ def dsa_cria_ou_conecta_banco():
         # Retorna None para indicar falha na conexão
         return None
 
+# Define a função para extrair os dados de todos os tickers em uma única chamada
+def dsa_extrai_dados_em_lote() -> pd.DataFrame | None:
+
+    try:
+
+        # Registra no log o início da extração em lote
+        logging.info(f"Extraindo dados em lote para {len(ACOES_PARA_ACOMPANHAR)} tickers...")
+
+        # Baixa o histórico de todos os tickers de uma vez, com colunas agrupadas por ticker
+        # Uma única chamada substitui uma requisição HTTP por símbolo
+        # actions=False evita baixar dividendos/desdobramentos, que o pipeline descarta
+        # auto_adjust=True fixa explicitamente a política de preços ajustados nos dois caminhos de extração
+        dados = yf.download(
+            ACOES_PARA_ACOMPANHAR,
+            period='5d',
+            group_by='ticker',
+            threads=True,
+            progress=False,
+            actions=False,
+            auto_adjust=True
+        )
+
+        # Verifica se os dados estão vazios (sem resultados)
+        if dados is None or dados.empty:
+
+            # Registra um aviso no log caso nenhum dado tenha sido retornado
+            logging.warning("A extração em lote não retornou dados.")
+            return None
+
+        # Retorna o DataFrame com colunas multi-índice (ticker, campo)
+        return dados
+
+    except Exception as e:
+
+        # Registra no log qualquer exceção que tenha ocorrido durante a extração em lote
+        logging.error(f"Falha na extração em lote: {e}")
+
+        # Retorna None em caso de erro
+        return None
+
 # Define a função para extrair os dados mais recentes de um determinado ticker
-def dsa_extrai_dados_acao(ticker):
+# Alternativa para tickers ausentes da resposta em lote: consulta o JSON de gráficos
+# do Yahoo Finance direto via requests e devolve as linhas já como tuplas prontas para
+# o executemany, sem construir um DataFrame intermediário que seria achatado logo depois
+def dsa_extrai_linhas_acao(ticker: str, datetime_coleta: str) -> list[tuple] | None:
 
     try:
 
         # Registra no log o início da extração de dados para o ticker fornecido
         logging.info(f"Extraindo dados para o ticker: {ticker}...")
-        
-        # Cria um objeto Ticker usando o módulo yfinance
-        acao = yf.Ticker(ticker)
-        
-        # Obtém o histórico de preços da ação para o período de 5 dias
-        dados = acao.history(period='5d')
-        
-        # Verifica se os dados estão vazios (sem resultados)
-        if dados.empty:
+
+        # Monta a URL do endpoint de gráficos do Yahoo Finance para o período de 5 dias
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}?range=5d&interval=1d"
+
+        # Faz a requisição HTTP pela sessão compartilhada, reutilizando a conexão do pool
+        # (o Yahoo rejeita requisições sem User-Agent de navegador)
+        resposta = SESSAO_HTTP.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30)
+        resposta.raise_for_status()
+
+        # Extrai do JSON os vetores de timestamps e de cotações do primeiro resultado
+        resultado = resposta.json()['chart']['result'][0]
+        carimbos = resultado.get('timestamp') or []
+        cotacoes = resultado['indicators']['quote'][0]
+
+        # Combina os vetores em tuplas na ordem esperada pelo UPSERT,
+        # pulando dias sem fechamento (feriados vêm como null no JSON)
+        linhas = []
+        for carimbo, abertura, alta, baixa, fechamento, volume in zip(
+            carimbos, cotacoes['open'], cotacoes['high'], cotacoes['low'], cotacoes['close'], cotacoes['volume']
+        ):
+            if fechamento is None:
+                continue
+            data_pregao = datetime.fromtimestamp(carimbo, tz=timezone.utc).strftime('%Y-%m-%d')
+            linhas.append((ticker, data_pregao, abertura, alta, baixa, fechamento, volume, datetime_coleta))
+
+        # Verifica se alguma linha foi extraída
+        if not linhas:
 
             # Registra um aviso no log caso nenhum dado tenha sido retornado
             logging.warning(f"Não foram encontrados dados para o ticker {ticker}.")
             return None
-        
-        # Retorna os dados extraídos
-        return dados
+
+        # Retorna as linhas extraídas
+        return linhas
 
     except Exception as e:
 
         # Registra no log qualquer exceção que tenha ocorrido durante a extração
         logging.error(f"Falha ao extrair dados para {ticker}: {e}")
-        
+
         # Retorna None em caso de erro
         return None
 
 # Define a função para limpar e transformar os dados brutos extraídos para o formato desejado
-def dsa_limpa_e_transforma_dados(df_bruto, ticker):
+# Recebe o timestamp da coleta calculado uma única vez em main(), de modo que todos
+# os tickers da mesma execução compartilhem o mesmo datetime_coleta
+def dsa_limpa_e_transforma_dados(df_bruto: pd.DataFrame | None, ticker: str, datetime_coleta: str) -> pd.DataFrame | None:
 
     # Verifica se o DataFrame de entrada é None ou está vazio
     if df_bruto is None or df_bruto.empty:
@@ -111,40 +238,36 @@ def dsa_limpa_e_transforma_dados(df_bruto, ticker):
     
     # Registra no log o início da transformação dos dados para o ticker informado
     logging.info(f"Transformando dados para o ticker: {ticker}...")
-    
-    # Reseta o índice do DataFrame para transformar a coluna 'Date' em coluna normal
-    df_transformado = df_bruto.reset_index()
-    
-    # Adiciona a coluna 'ticker' com o valor correspondente
-    df_transformado['ticker'] = ticker
-    
-    # Adiciona a coluna com o timestamp da coleta dos dados
-    df_transformado['datetime_coleta'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Renomeia as colunas para nomes padronizados em português
-    df_transformado.rename(columns={
-        'Date': 'data_pregao',
-        'Open': 'abertura',
-        'High': 'alta',
-        'Low': 'baixa',
-        'Close': 'fechamento',
-        'Volume': 'volume'
-    }, inplace=True)
-    
-    # Define a lista de colunas que devem estar no DataFrame final
-    colunas_desejadas = ['ticker', 'data_pregao', 'abertura', 'alta', 'baixa', 'fechamento', 'volume', 'datetime_coleta']
-    
-    # Cria uma cópia do DataFrame contendo apenas as colunas desejadas e que existem no DataFrame transformado
-    df_final = df_transformado[[col for col in colunas_desejadas if col in df_transformado.columns]].copy()
-    
-    # Converte a coluna 'data_pregao' para o tipo date (sem hora), garantindo consistência no formato
-    df_final['data_pregao'] = pd.to_datetime(df_final['data_pregao']).dt.date
-    
+
+    # Constrói o DataFrame final de uma vez, direto dos arrays subjacentes do DataFrame
+    # bruto, sem a cadeia reset_index/rename/subconjunto/copy que alocava um DataFrame
+    # intermediário por ticker; os escalares ticker/datetime_coleta são difundidos pelo pandas
+    # O índice de datas vira string ISO (YYYY-MM-DD) de forma vetorizada, formato
+    # aceito pelo DATE do SQLite
+    df_final = pd.DataFrame({
+        'ticker': ticker,
+        'data_pregao': pd.to_datetime(df_bruto.index).strftime('%Y-%m-%d'),
+        'abertura': df_bruto['Open'].to_numpy(),
+        'alta': df_bruto['High'].to_numpy(),
+        'baixa': df_bruto['Low'].to_numpy(),
+        'fechamento': df_bruto['Close'].to_numpy(),
+        'volume': df_bruto['Volume'].to_numpy(),
+        'datetime_coleta': datetime_coleta
+    })
+
+    # Ajusta os tipos numéricos ao schema do banco: volume vira int64 (a coluna é
+    # INTEGER) e os preços descem para float32, metade dos bytes trafegando no caminho
+    # pandas -> sqlite3 com precisão de sobra para cotações
+    # Dias sem volume (NaN) viram 0 para permitir a conversão para inteiro
+    df_final['volume'] = df_final['volume'].fillna(0).astype('int64', copy=False)
+    for coluna in ('abertura', 'alta', 'baixa', 'fechamento'):
+        df_final[coluna] = df_final[coluna].astype('float32', copy=False)
+
     # Retorna o DataFrame final transformado
     return df_final
 
 # Define a função responsável por carregar os dados transformados no banco de dados SQLite
-def dsa_carrega_dados(df, conn):
+def dsa_carrega_dados(df: pd.DataFrame | None, conn: sqlite3.Connection) -> None:
 
     # Verifica se o DataFrame está vazio ou é None
     if df is None or df.empty:
@@ -153,52 +276,71 @@ def dsa_carrega_dados(df, conn):
         logging.warning("DataFrame vazio, nada para carregar no banco de dados.")
         return
 
+    # Define explicitamente a ordem das colunas esperada pela query de UPSERT
+    colunas = ['ticker', 'data_pregao', 'abertura', 'alta', 'baixa', 'fechamento', 'volume', 'datetime_coleta']
+
+    # Escreve o lote inteiro na tabela de staging (sem chave primária) usando
+    # INSERTs multi-linha por chunk, o caminho de carga em massa do pandas
+    # Roda fora da transação explícita: staging é área de rascunho, regravada a cada execução
+    df[colunas].to_sql(NOME_TABELA_STAGE, conn, if_exists='replace', index=False, method='multi', chunksize=500)
+
+    # Abre explicitamente a transação que protege a tabela final
+    conn.execute("BEGIN IMMEDIATE;")
+
     try:
 
-        # Cria um cursor para executar comandos SQL no banco de dados
-        cursor = conn.cursor()
-        
-        # Itera sobre as linhas do DataFrame, uma por uma
-        for _, row in df.iterrows():
-
-            # Define a query SQL para inserir ou atualizar os dados na tabela
-            query = f"""
-            INSERT INTO {NOME_TABELA} (ticker, data_pregao, abertura, alta, baixa, fechamento, volume, datetime_coleta)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(ticker, data_pregao) DO UPDATE SET
-                abertura=excluded.abertura,
-                alta=excluded.alta,
-                baixa=excluded.baixa,
-                fechamento=excluded.fechamento,
-                volume=excluded.volume,
-                datetime_coleta=excluded.datetime_coleta;
-            """
-
-            # Extrai os valores da linha atual como uma tupla
-            valores = tuple(row)
-            
-            # Executa a query com os valores fornecidos
-            cursor.execute(query, valores)
-        
-        # Confirma (salva) todas as operações realizadas no banco de dados
-        conn.commit()
-        
-        # Obtém o ticker da primeira linha do DataFrame para registro no log
-        ticker_log = df['ticker'].iloc[0]
-        
-        # Registra no log que os dados foram carregados/atualizados com sucesso
-        logging.info(f"Dados para o ticker '{ticker_log}' carregados/atualizados com sucesso.")
-    
-    except sqlite3.Error as e:
+        # Aplica a tabela de staging sobre a tabela final com um único UPSERT
+        # Uma única instrução SQL, independentemente do número de linhas
+        conn.execute(_SQL_UPSERT_LOTE)
 
-        # Registra o erro ocorrido no log
-        logging.error(f"Erro ao carregar dados no banco de dados: {e}")
-        
-        # Desfaz qualquer alteração feita na transação atual em caso de erro
-        conn.rollback()
+        # Confirma a transação com um único fsync
+        conn.execute("COMMIT;")
+
+    except sqlite3.Error:
+
+        # Desfaz a transação e propaga o erro para main()
+        conn.execute("ROLLBACK;")
+        raise
+
+    # Conta quantos tickers distintos foram carregados para registro no log
+    total_tickers = df['ticker'].nunique()
+
+    # Registra no log que os dados foram carregados/atualizados com sucesso
+    logging.info(f"{len(df)} linhas de {total_tickers} ticker(s) carregadas/atualizadas com sucesso.")
+
+# Define a função responsável por carregar no banco as linhas já em formato de tupla
+# (caminho alternativo, que extrai direto do JSON sem passar pelo pandas)
+def dsa_carrega_linhas(linhas: list[tuple], conn: sqlite3.Connection) -> None:
+
+    # Verifica se há linhas a carregar
+    if not linhas:
+
+        # Registra um aviso no log e encerra a função se não houver dados a carregar
+        logging.warning("Nenhuma linha para carregar no banco de dados.")
+        return
+
+    # Abre explicitamente a transação que protege a carga do lote de tuplas
+    conn.execute("BEGIN IMMEDIATE;")
+
+    try:
+
+        # Executa o UPSERT em lote sobre as tuplas, reaproveitando o statement preparado
+        conn.executemany(_SQL_UPSERT_LINHA, linhas)
+
+        # Confirma a transação com um único fsync
+        conn.execute("COMMIT;")
+
+    except sqlite3.Error:
+
+        # Desfaz a transação e propaga o erro para main()
+        conn.execute("ROLLBACK;")
+        raise
+
+    # Registra no log que as linhas foram carregadas/atualizadas com sucesso
+    logging.info(f"{len(linhas)} linha(s) do caminho alternativo carregadas/atualizadas com sucesso.")
 
 # Define a função principal que orquestra toda a execução do pipeline financeiro
-def main():
+def main() -> None:
 
     # Registra no log o início da execução do pipeline
     logging.info("--- INICIANDO A EXECUÇÃO DO PIPELINE FINANCEIRO ---")
@@ -211,31 +353,108 @@ def main():
         logging.critical("Não foi possível estabelecer conexão com o banco de dados. Encerrando o pipeline.")
         return
     
-    # Itera sobre a lista de ações a serem monitoradas
-    for ticker in ACOES_PARA_ACOMPANHAR:
+    try:
 
-        # Extrai os dados brutos do ticker atual
-        dados_brutos = dsa_extrai_dados_acao(ticker)
-        
-        # Aplica limpeza e transformação aos dados extraídos
-        dados_limpos = dsa_limpa_e_transforma_dados(dados_brutos, ticker)
-        
-        # Se os dados estiverem prontos para carga, insere no banco
-        if dados_limpos is not None:
-            dsa_carrega_dados(dados_limpos, conn)
-        else:
-            # Caso não haja dados, registra aviso no log
-            logging.warning(f"Processamento pulado para o ticker {ticker} devido à ausência de dados.")
-    
-    # Fecha a conexão com o banco de dados ao final do pipeline
-    conn.close()
-    
-    # Registra no log que a conexão foi encerrada
-    logging.info(f"Conexão com o banco de dados '{NOME_BANCO_DADOS}' fechada.")
+        # Calcula o timestamp da coleta uma única vez para toda a execução do pipeline
+        datetime_coleta = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        # Extrai os dados de todos os tickers em uma única requisição
+        dados_lote = dsa_extrai_dados_em_lote()
+
+        # Lista de DataFrames limpos de todos os tickers, carregados de uma vez ao final
+        frames = []
+
+        # Lista de tickers que ficaram de fora do lote e precisarão da extração individual
+        tickers_pendentes = []
+
+        # Itera sobre a lista de ações a serem monitoradas
+        for ticker in ACOES_PARA_ACOMPANHAR:
+
+            # Começa sem dados para o ticker atual
+            dados_brutos = None
+
+            # Se a extração em lote funcionou e contém o ticker, usa a fatia correspondente
+            if dados_lote is not None and ticker in dados_lote.columns.get_level_values(0):
+
+                # Seleciona apenas as colunas do ticker e descarta dias totalmente vazios
+                dados_brutos = dados_lote.xs(ticker, axis=1, level=0).dropna(how='all')
+
+            # Se o ticker não veio no lote (ou veio vazio), deixa para a extração individual
+            if dados_brutos is None or dados_brutos.empty:
+                tickers_pendentes.append(ticker)
+                continue
+
+            # Aplica limpeza e transformação aos dados extraídos
+            dados_limpos = dsa_limpa_e_transforma_dados(dados_brutos, ticker, datetime_coleta)
+
+            # Se os dados estiverem prontos, acumula para a carga única ao final
+            if dados_limpos is not None:
+                frames.append(dados_limpos)
+            else:
+                # Caso não haja dados, registra aviso no log
+                logging.warning(f"Processamento pulado para o ticker {ticker} devido à ausência de dados.")
+
+        # Extrai em paralelo os tickers pendentes: o tempo de espera de rede é sobreposto
+        # entre as threads, enquanto as escritas no banco permanecem na thread principal
+        # (a conexão SQLite não é segura para uso em múltiplas threads)
+        # Linhas (tuplas) produzidas pelo caminho alternativo, carregadas de uma vez ao final
+        linhas_pendentes = []
+
+        if tickers_pendentes:
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+
+                # Submete uma extração individual por ticker pendente
+                futuros = {executor.submit(dsa_extrai_linhas_acao, ticker, datetime_coleta): ticker for ticker in tickers_pendentes}
+
+                # Processa os resultados conforme forem chegando
+                for futuro in concurrent.futures.as_completed(futuros):
+
+                    # Recupera o ticker associado ao futuro concluído
+                    ticker = futuros[futuro]
+
+                    # Recupera as linhas extraídas (já em formato de tupla)
+                    linhas = futuro.result()
+
+                    # Se há linhas prontas, acumula para a carga única ao final
+                    if linhas:
+                        linhas_pendentes.extend(linhas)
+                    else:
+                        # Caso não haja dados, registra aviso no log
+                        logging.warning(f"Processamento pulado para o ticker {ticker} devido à ausência de dados.")
+
+        # Concatena os DataFrames de todos os tickers e faz uma única carga no banco,
+        # amortizando o custo de transação e statement sobre o maior lote possível
+        if frames:
+            dsa_carrega_dados(pd.concat(frames, ignore_index=True), conn)
+
+        # Carrega também, de uma vez, as linhas vindas do caminho alternativo
+        if linhas_pendentes:
+            dsa_carrega_linhas(linhas_pendentes, conn)
+
+        # Caso nenhum ticker tenha retornado dados, registra aviso no log
+        if not frames and not linhas_pendentes:
+            logging.warning("Nenhum dado disponível para carga nesta execução.")
+
+    except sqlite3.Error as e:
+
+        # Registra o erro no log; a carga em andamento já foi desfeita (ROLLBACK) pelo carregador
+        logging.error(f"Erro ao carregar dados no banco de dados (transação desfeita): {e}")
+
+    finally:
+
+        # Fecha a conexão com o banco de dados ao final do pipeline
+        conn.close()
+
+        # Registra no log que a conexão foi encerrada
+        logging.info(f"Conexão com o banco de dados '{NOME_BANCO_DADOS}' fechada.")
     
     # Registra no log o fim da execução do pipeline
     logging.info("--- PIPELINE EXECUTADO COM SUCESSO ---")
 
+    # Descarrega para o arquivo os registros de log ainda retidos em memória
+    _manipulador_arquivo_log.flush()
+
 # Bloco principal de execução do script
 if __name__ == '__main__':
     main()